@@ -1,24 +1,37 @@
 # djia_analysis/src/__init__.py
 
-# Expose data handling functions
-from .data import fetch_data, clean_data
+import importlib
 
-# Expose analysis functions
-from .analysis import (
-    calculate_return, 
-    calculate_std, 
-    calculate_sharpe_ratio, 
-    test_hypothesis, 
-    plot_results
-)
+# Map each exposed function to the submodule that defines it. Submodules
+# are only imported on first access (PEP 562), so "from src import fetch_data"
+# does not pay for the analysis imports.
+_EXPORTS = {
+    # Data handling functions
+    'fetch_data': '.data',
+    'clean_data': '.data',
+
+    # Analysis functions
+    'calculate_risk_return': '.analysis',
+    'calculate_return': '.analysis',
+    'calculate_std': '.analysis',
+    'calculate_sharpe_ratio': '.analysis',
+    'test_hypothesis': '.analysis',
+    'plot_results': '.analysis',
+    'plot_bubble': '.analysis',
+    'plot_bar': '.analysis',
+}
 
 # Define what gets imported if someone uses "from src import *"
-__all__ = [
-    'fetch_data',
-    'clean_data',
-    'calculate_return',
-    'calculate_std',
-    'calculate_sharpe_ratio',
-    'test_hypothesis',
-    'plot_results',
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    '''Imports the submodule that defines an exposed function on first access.'''
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,14 +7,175 @@ performs hypothesis testing on the risk-return relationship.
 
 import pandas as pd
 import numpy as np
-from scipy import stats
-import matplotlib.pyplot as plt
+
+__all__ = [
+    'calculate_risk_return',
+    'calculate_return',
+    'calculate_std',
+    'calculate_sharpe_ratio',
+    'test_hypothesis',
+    'plot_results',
+    'plot_bubble',
+    'plot_bar',
+]
+
+# Annualization factors for weekly data
+_WEEKS_PER_YEAR = 52
+_SQRT_52 = float(np.sqrt(52.0))
+
+# Bar colors for plot_bar(), indexed by (sharpe_ratio > 0)
+_BAR_COLORS = np.array(['firebrick', 'steelblue'])
+
+def _stock_codes(stock):
+    """Maps each ticker to an integer code.
+
+    Uses the category codes when the stock column is categorical (as
+    returned by clean_data), so no strings are hashed or compared.
+
+    Args:
+        stock: The 'stock' Series.
+
+    Returns:
+        A tuple (codes, labels) where labels[codes[i]] is the ticker of row
+        i. Missing tickers get code -1.
+    """
+    if isinstance(stock.dtype, pd.CategoricalDtype):
+        return stock.cat.codes.to_numpy(), stock.cat.categories.to_numpy()
+
+    codes, labels = pd.factorize(stock, sort=True)
+    return codes, np.asarray(labels)
+
+def _weekly_return_stats(close, stock_key, stock_labels):
+    """Calculates the mean and std of weekly returns for each stock with NumPy.
+
+    Args:
+        close: float64 array of closing prices, sorted by stock and date.
+        stock_key: The matching non-negative stock codes.
+        stock_labels: The tickers indexed by stock code.
+
+    Returns:
+        A tuple (stocks, means, stds) with one entry per stock present.
+    """
+    # Shift the whole column at once; the first week of each stock has no
+    # previous close, so mask the rows where the stock changes
+    weekly_return = np.empty_like(close)
+    weekly_return[0] = np.nan
+    np.divide(close[1:], close[:-1], out=weekly_return[1:])
+    weekly_return[1:] -= 1.0
+    first_week = np.r_[True, stock_key[1:] != stock_key[:-1]]
+    weekly_return[first_week] = np.nan
+
+    # The data is sorted by stock, so each stock is one contiguous run and
+    # can be reduced with np.add.reduceat instead of a hashed groupby. Only
+    # stocks present in the data get a run, so unused categories never
+    # produce empty groups and the keys are already in sorted order
+    starts = np.flatnonzero(first_week)
+    counts = np.diff(np.r_[starts, len(weekly_return)])
+    is_valid = ~np.isnan(weekly_return)
+    n_valid = np.add.reduceat(is_valid, starts, dtype=np.int64)
+
+    # weekly_return is a private scratch array, so update it in place
+    # rather than allocating a new N-sized temporary for every step
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.nan_to_num(weekly_return, copy=False, nan=0.0)
+        means = np.add.reduceat(weekly_return, starts) / n_valid
+
+        # Two-pass sample standard deviation (ddof=1), matching pandas.
+        # Zero the deviations of the masked weeks before squaring
+        weekly_return -= np.repeat(means, counts)
+        weekly_return *= is_valid
+        np.square(weekly_return, out=weekly_return)
+        stds = np.sqrt(np.add.reduceat(weekly_return, starts) / (n_valid - 1))
+    stds[n_valid < 2] = np.nan
+
+    return stock_labels[stock_key[starts]], means, stds
+
+def _is_sorted_by_stock_and_date(stock_key, date):
+    """Checks in O(N) whether rows are sorted by stock code and then date.
+
+    Args:
+        stock_key: Integer stock codes, as returned by _stock_codes().
+        date: The matching 'date' array.
+
+    Returns:
+        True if the rows are already in stock/date order.
+    """
+    same_stock = stock_key[1:] == stock_key[:-1]
+    stock_in_order = (stock_key[1:] >= stock_key[:-1]).all()
+    date_in_order = (date[1:][same_stock] >= date[:-1][same_stock]).all()
+
+    return bool(stock_in_order and date_in_order)
+
+def calculate_risk_return(df, use_kernel=False):
+    """Calculates the annualized return and standard deviation for each stock.
+
+    Both metrics are computed in a single vectorized pass over the 'close'
+    array. Rows are expected to be sorted by 'stock' and then 'date', as
+    returned by clean_data(); unsorted input is detected and sorted first.
+
+    Args:
+        df: A DataFrame containing 'stock', 'date', and 'close' columns.
+        use_kernel: If True, use the numba kernel in kernels.py instead of
+            NumPy (requires numba). Off by default: in measurements it is
+            no faster than NumPy even at 1M rows, and it adds numba's
+            import and compile time.
+
+    Returns:
+        A DataFrame with columns ['stock', 'annualized_return', 'annualized_std'].
+        Returns an empty DataFrame if input is empty.
+    """
+    if df.empty:
+        return df
+
+    codes, labels = _stock_codes(df['stock'])
+
+    # Like groupby, drop rows without a ticker (code -1)
+    has_stock = codes >= 0
+    if not has_stock.all():
+        df = df[has_stock]
+        codes = codes[has_stock]
+        if df.empty:
+            return pd.DataFrame(columns=['stock', 'annualized_return', 'annualized_std'])
+
+    # Both paths below depend on the stock/date ordering. Check and sort on
+    # the integer codes, so mixed or missing tickers never get compared
+    date = df['date'].to_numpy()
+    if not _is_sorted_by_stock_and_date(codes, date):
+        order = np.lexsort((date, codes))
+        df = df.take(order)
+        codes = codes[order]
+
+    close = df['close'].to_numpy(dtype=np.float64)
+
+    if use_kernel:
+        # Imported here so numba is only loaded when explicitly requested
+        from .kernels import returns_and_std
+
+        # Compiled single-pass kernel keyed on integer stock codes
+        means, stds, n_rows = returns_and_std(close, codes, len(labels))
+        observed = n_rows > 0
+        stocks = labels[observed]
+        avg_weekly_return = means[observed]
+        avg_weekly_std = stds[observed]
+    else:
+        stocks, avg_weekly_return, avg_weekly_std = _weekly_return_stats(close, codes, labels)
+
+    # Annualize the weekly returns (52 weeks in a year) and the volatility
+    # (multiply by sqrt(52) because variance scales with time)
+    df_risk_return = pd.DataFrame({
+        'stock': stocks,
+        'annualized_return': avg_weekly_return * _WEEKS_PER_YEAR,
+        'annualized_std': avg_weekly_std * _SQRT_52,
+    })
+
+    return df_risk_return
 
 def calculate_return(df):
     '''Calculates the annualized return for each stock.
 
     Args:
-        df: A DataFrame containing 'stock', 'date', and 'close' columns
+        df: A DataFrame containing 'stock', 'date', and 'close' columns,
+            or a frame already returned by calculate_risk_return().
 
     Returns:
         A DataFrame with columns ['stock', 'annualized_return'].
@@ -23,21 +184,18 @@ def calculate_return(df):
     if df.empty:
         return df
 
-    df = df.sort_values(by=['stock', 'date'])
-    df['weekly_return'] = df.groupby('stock')['close'].pct_change()
-
-    df_return = df.groupby('stock')['weekly_return'].mean().reset_index(name='avg_weekly_return')
+    # Reuse already aggregated per-stock metrics instead of recomputing them
+    if 'annualized_return' not in df.columns:
+        df = calculate_risk_return(df)
 
-    # Annualize the weekly_returns (52 weeks in a year)
-    df_return['annualized_return'] = df_return['avg_weekly_return'] * 52
-
-    return df_return[['stock','annualized_return']]
+    return df[['stock', 'annualized_return']]
 
 def calculate_std(df):
     """Calculates the annualized standard deviation (risk) for each stock.
 
     Args:
-        df: A DataFrame containing 'stock', 'date', and 'close' columns.
+        df: A DataFrame containing 'stock', 'date', and 'close' columns,
+            or a frame already returned by calculate_risk_return().
 
     Returns:
         A DataFrame with columns ['stock', 'annualized_std'].
@@ -46,36 +204,72 @@ def calculate_std(df):
     if df.empty:
         return df
 
-    df = df.sort_values(by=['stock', 'date'])
-    df['weekly_return'] = df.groupby('stock')['close'].pct_change()
+    # Reuse already aggregated per-stock metrics instead of recomputing them
+    if 'annualized_std' not in df.columns:
+        df = calculate_risk_return(df)
 
-    # Calculate the standard deviation
-    df_std = df.groupby('stock')['weekly_return'].std().reset_index(name='avg_weekly_std')
+    return df[['stock', 'annualized_std']]
 
-    # Annualize the volatility: multiply by sqrt(52) because variance scales with time
-    df_std['annualized_std'] = df_std['avg_weekly_std'] * np.sqrt(52)
-
-    return df_std[['stock','annualized_std']]
-
-def calculate_sharpe_ratio(df_return, df_std, risk_free_rate=0.02):
+def calculate_sharpe_ratio(df_risk_return, risk_free_rate=0.02):
     """Calculates the sharpe ratio for each stock.
 
     Formula: (Annualized Return - Risk Free Rate) / Annualized Risk
 
     Args:
-        df_return: DataFrame with 'stock' and 'annualized_return'.
-        df_std: DataFrame with 'stock' and 'annualized_std'.
+        df_risk_return: DataFrame with 'stock', 'annualized_return' and
+            'annualized_std', as returned by calculate_risk_return().
         risk_free_rate: The theoretical return of an investment with zero risk.
 
     Returns:
-        A merged DataFrame including the calculated 'sharpe_ratio'.
+        A DataFrame including the calculated 'sharpe_ratio'.
     """
-    df_merge = pd.merge(df_return, df_std, on='stock', how='inner')
-    df_merge['sharpe_ratio'] = (
-        (df_merge['annualized_return'] - risk_free_rate) / df_merge['annualized_std']
+    df_sharpe = df_risk_return[['stock', 'annualized_return', 'annualized_std']].copy()
+
+    # Both columns come from the same row of the fused frame, so they are
+    # aligned by construction and plain array arithmetic is enough.
+    # Take the reciprocal once and multiply rather than divide per stock
+    inv_std = 1.0 / df_sharpe['annualized_std'].to_numpy()
+    df_sharpe['sharpe_ratio'] = (
+        (df_sharpe['annualized_return'].to_numpy() - risk_free_rate) * inv_std
     )
 
-    return df_merge[['stock', 'annualized_return', 'annualized_std', 'sharpe_ratio']]
+    return df_sharpe
+
+def _linear_regression(x, y):
+    """Fits y = slope * x + intercept and tests Ha: slope > 0.
+
+    Args:
+        x: float64 array of the independent variable.
+        y: float64 array of the dependent variable.
+
+    Returns:
+        A tuple (slope, intercept, r_squared, p_value_one_sided).
+    """
+    n = len(x)
+
+    # Closed-form ordinary least squares on the centered data
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = dx @ dx
+    sxy = dx @ dy
+    syy = dy @ dy
+
+    slope = sxy / sxx
+    intercept = y.mean() - slope * x.mean()
+    r_squared = sxy**2 / (sxx * syy)
+
+    # One-sided t-test for Ha: slope > 0 with n - 2 degrees of freedom.
+    # If slope is negative, p-value for Ha > 0 is 1.0 (no evidence), and
+    # scipy is only imported when it is actually needed.
+    if slope > 0:
+        from scipy import stats
+
+        std_err = np.sqrt((1 - r_squared) * syy / sxx / (n - 2))
+        p_value_one_sided = stats.t.sf(slope / std_err, n - 2)
+    else:
+        p_value_one_sided = 1.0
+
+    return slope, intercept, r_squared, p_value_one_sided
 
 def test_hypothesis(df_sharpe_ratio, alpha=0.05):
     """Tests the null hypothesis that there is no linear relationship between risk and return.
@@ -90,21 +284,14 @@ def test_hypothesis(df_sharpe_ratio, alpha=0.05):
     Returns:
         The slope and intercept of the linear regression line.
     """
-    slope, intercept, r_value, p_value, std_err = stats.linregress(
-        df_sharpe_ratio['annualized_std'],
-        df_sharpe_ratio['annualized_return']
+    slope, intercept, r_squared, p_value_one_sided = _linear_regression(
+        df_sharpe_ratio['annualized_std'].to_numpy(dtype=np.float64),
+        df_sharpe_ratio['annualized_return'].to_numpy(dtype=np.float64)
     )
 
-    # Scipy returns a two-sided p-value. For Ha: slope > 0, we halve it.
-    # If slope is negative, p-value for Ha > 0 is 1.0 (no evidence).
-    if slope > 0:
-        p_value_one_sided = p_value / 2
-    else:
-        p_value_one_sided = 1.0
-
     print("\n--- Hypothesis Test Results ---")
     print(f"Regression Slope: {slope:.2f}")
-    print(f"R-Squared Value: {r_value**2:.2f}")
+    print(f"R-Squared Value: {r_squared:.2f}")
     print(f"One-Sided P-Value: {p_value_one_sided:.2f}")
 
     if p_value_one_sided < alpha and slope > 0:
@@ -125,16 +312,22 @@ def plot_results(df, slope, intercept):
         slope: The slope of the regression line (from hypothesis_test).
         interept: The y-intercpet of the regression line.
     '''
+    import matplotlib.pyplot as plt
+
+    annualized_std, annualized_return = (
+        df[col].to_numpy() for col in ('annualized_std', 'annualized_return')
+    )
+
     plt.figure(figsize=(10,8))
 
     scatter = plt.scatter(
-        x=df['annualized_std'],
-        y=df['annualized_return'],
+        x=annualized_std,
+        y=annualized_return,
         s=100,
         c='steelblue'
     )
 
-    x_line = np.array([df['annualized_std'].min(), df['annualized_std'].max()])
+    x_line = np.array([np.nanmin(annualized_std), np.nanmax(annualized_std)])
     y_line = slope * x_line + intercept
 
     plt.plot(
@@ -159,16 +352,23 @@ def plot_bubble(df):
         df: DataFrame containing 'annualized_std', 'annualized_return',
             and 'sharpe_ratio'.
     '''
+    import matplotlib.pyplot as plt
+
+    annualized_std, annualized_return, sharpe_ratio = (
+        df[col].to_numpy()
+        for col in ('annualized_std', 'annualized_return', 'sharpe_ratio')
+    )
+
     plt.figure(figsize=(10,8))
 
     # Increase the size of the bubbles so they are more visible
-    bubble_size = df['sharpe_ratio'].abs() * 1000
+    bubble_size = np.abs(sharpe_ratio) * 1000
 
     scatter = plt.scatter(
-        x=df['annualized_std'],
-        y=df['annualized_return'],
+        x=annualized_std,
+        y=annualized_return,
         s=bubble_size,
-        c=df['sharpe_ratio'],
+        c=sharpe_ratio,
         alpha=0.6
     )
 
@@ -191,16 +391,25 @@ def plot_bar(df):
         df: DataFrame containing 'annualized_std', 'annualized_return',
             and 'sharpe_ratio'.
     '''
-    df_sort = df.sort_values(by='sharpe_ratio', ascending=False)
+    import matplotlib.pyplot as plt
+
+    df_sort = df.sort_values(
+        by='sharpe_ratio', ascending=False, kind='stable'
+    ).reset_index(drop=True)
+    stock, sharpe_ratio, annualized_std = (
+        df_sort[col].to_numpy()
+        for col in ('stock', 'sharpe_ratio', 'annualized_std')
+    )
     fig, ax1 = plt.subplots(figsize=(14,6))
 
     ax1.set_xlabel('Stocks')
     ax1.set_ylabel('Sharpe Ratio')
 
-    bar_color = np.where(df_sort['sharpe_ratio'] > 0, 'steelblue', 'firebrick')
+    # Index into a two-color table: 0 -> firebrick, 1 -> steelblue
+    bar_color = _BAR_COLORS[(sharpe_ratio > 0).astype(np.int8)]
     ax1.bar(
-        df_sort['stock'], 
-        df_sort['sharpe_ratio'], 
+        stock, 
+        sharpe_ratio, 
         color=bar_color 
     )
 
@@ -213,8 +422,8 @@ def plot_bar(df):
     ax2 = ax1.twinx()
     ax2.set_ylabel('Annualized Standard Deviation (Risk)')
     ax2.plot(
-        df_sort['stock'],
-        df_sort['annualized_std'],
+        stock,
+        annualized_std,
         color='black',
         linestyle='--'
     )
@@ -1,61 +1,177 @@
 # djia_analysis/src/data.py
 '''Data loading and cleaning module for DJIA analysis.'''
 
+import os
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+__all__ = ['fetch_data', 'clean_data']
+
 # Constants
-FILE_PATH = '/Users/racepartin/repos/djia_analysis/data/dow_jones_index.data'
+# The dataset path can be overridden with the DJIA_DATA environment variable
+FILE_PATH = Path(os.environ.get(
+    'DJIA_DATA',
+    Path(__file__).resolve().parent.parent / 'data' / 'dow_jones_index.data'
+))
+
+# Bump whenever clean_data() changes what it produces. The version is part
+# of the cache file name, so caches written by older code are never read.
+_CACHE_VERSION = 1
+CACHE_PATH = FILE_PATH.with_name(f'{FILE_PATH.name}.v{_CACHE_VERSION}.parquet')
+
+PRICE_COLUMNS = [
+    'open', 'high', 'low', 'close', 
+    'next_weeks_open', 'next_weeks_close'
+]
+
+def _parse_price(value):
+    """Converts a raw price string such as '$15.82' to a float."""
+    if not value:
+        return np.nan
+    if value[0] == '$':
+        value = value[1:]
+    return float(value)
+
+def _read_csv():
+    """Reads the CSV at FILE_PATH, parsing dates, tickers and prices.
+
+    Uses pyarrow's multithreaded CSV reader when pyarrow is installed. It
+    types 'date' and 'stock' directly and leaves the '$' prices as strings
+    for clean_data(). Otherwise falls back to pandas' reader with a
+    per-column price converter.
+
+    Returns:
+        pd.DataFrame: The parsed, unsorted stock data.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(
+            FILE_PATH,
+            parse_dates=['date'],
+            date_format='%m/%d/%Y',
+            dtype={'stock': 'category'},
+            converters={col: _parse_price for col in PRICE_COLUMNS},
+        )
+
+    convert_options = pacsv.ConvertOptions(
+        column_types={
+            'stock': pa.dictionary(pa.int32(), pa.string()),
+            'date': pa.timestamp('ns'),
+        },
+        timestamp_parsers=['%m/%d/%Y'],
+    )
+    table = pacsv.read_csv(FILE_PATH, convert_options=convert_options)
+    return table.to_pandas()
 
 def fetch_data():
-    """Loads the DJIA dataset from the local CSV file.
+    """Loads the cleaned DJIA dataset.
 
-    Reads the file specified in the global FILE_PATH constant. Handles
-    errors if the file is missing.
+    Reads the Parquet cache at CACHE_PATH if it is at least as new as the
+    CSV file at FILE_PATH and was written by the current _CACHE_VERSION
+    of clean_data(). Otherwise reads the CSV, cleans it with
+    clean_data() and writes the cache for the next run. Handles errors if
+    the file is missing.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the raw stock data. 
+        pd.DataFrame: A DataFrame containing the cleaned stock data. 
         Returns an empty DataFrame if the file is not found.
     """
     try:
-        df = pd.read_csv(FILE_PATH)
+        if os.path.getmtime(CACHE_PATH) >= os.path.getmtime(FILE_PATH):
+            df = pd.read_parquet(CACHE_PATH)
+            print("Data successfully loaded from cache.")
+            return df
+    except (OSError, ValueError, ImportError):
+        # No cache yet (or no source file), an unreadable cache or no
+        # Parquet engine; fall back to the CSV and rebuild the cache
+        pass
+
+    try:
+        df = _read_csv()
         print("Data successfully loaded.")
-        return df
     except FileNotFoundError:
         print(f"ERROR: File cannot be located at {FILE_PATH}. Check file path.")
         return pd.DataFrame()
 
+    df = clean_data(df)
+
+    # Caching needs a Parquet engine (pyarrow or fastparquet). Write to a
+    # temporary file and move it into place, so an interrupted run never
+    # leaves a truncated cache behind
+    tmp_path = CACHE_PATH.with_name(f'{CACHE_PATH.stem}.{os.getpid()}.tmp.parquet')
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, CACHE_PATH)
+    except (ImportError, OSError):
+        print(f"WARNING: Could not write cache to {CACHE_PATH}.")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return df
+
 def clean_data(df):
     """Prepares the raw DataFrame for analysis.
 
-    Performs the following cleaning operations:
+    Performs the following cleaning operations, skipping any step that
+    fetch_data() already handled while reading the CSV:
     1. Converts the 'date' column to datetime objects.
     2. Removes '$' symbols from price columns (e.g., 'close', 'open').
-    3. Converts those price columns to numeric data types.
+    3. Converts those price columns to numeric (float32) data types.
+    4. Converts the 'stock' column to a categorical data type.
+    5. Sorts the rows by 'stock' and then 'date'.
 
     Args:
         df: The raw DataFrame loaded via fetch_data().
 
     Returns:
-        pd.DataFrame: The cleaned DataFrame with correct data types.
+        pd.DataFrame: The cleaned DataFrame with correct data types,
+        sorted by stock and date.
         Returns an empty DataFrame if input is empty.
     """
     if df.empty:
         return df
 
     # Convert 'date' to datetime object for analysis
-    if 'date' in df.columns:
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
         df['date'] = pd.to_datetime(df['date'])
 
-    clean_price_columns = [
-        'open', 'high', 'low', 'close', 
-        'next_weeks_open', 'next_weeks_close'
+    # Clean relevant columns by removing '$' in one pass over all of them
+    cols = [
+        col for col in PRICE_COLUMNS
+        if col in df.columns and df[col].dtype == 'object'
     ]
+    if cols:
+        df[cols] = (
+            df[cols]
+            .replace(r'\$', '', regex=True)
+            .apply(pd.to_numeric, downcast='float')
+        )
+
+    # Narrow dtypes so every later pass moves fewer bytes: float32 prices
+    # and integer category codes for the stock key
+    price_columns = [col for col in PRICE_COLUMNS if col in df.columns]
+    df[price_columns] = df[price_columns].astype(np.float32)
+
+    if 'stock' in df.columns:
+        df['stock'] = df['stock'].astype('category')
+
+        # Categoricals sort by code, so keep the categories alphabetical
+        # (pyarrow builds them in order of first appearance)
+        categories = df['stock'].cat.categories
+        if not categories.is_monotonic_increasing:
+            df['stock'] = df['stock'].cat.reorder_categories(categories.sort_values())
 
-    # Clean relevant columns by removing '$'
-    for col in clean_price_columns:
-        if col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].str.replace('$', '', regex=False)
-                df[col] = pd.to_numeric(df[col])
+    # Sort once here; the analysis functions rely on this ordering. Sort
+    # on the integer category codes, which follow the alphabetical
+    # category order, rather than comparing ticker strings
+    if 'stock' in df.columns and 'date' in df.columns:
+        order = np.lexsort((df['date'].to_numpy(), df['stock'].cat.codes.to_numpy()))
+        df = df.take(order).reset_index(drop=True)
 
     return df
\ No newline at end of file
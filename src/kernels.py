@@ -0,0 +1,61 @@
+# djia_analysis/src/kernels.py
+'''Numba-compiled kernels for the DJIA analysis hot paths.
+
+Requires numba. analysis.py falls back to its NumPy implementation when
+this module cannot be imported.
+'''
+
+import numpy as np
+from numba import njit
+
+__all__ = ['returns_and_std']
+
+@njit(cache=True)
+def returns_and_std(close, group_ids, n_groups):
+    """Calculates the mean and standard deviation of weekly returns per group.
+
+    Makes a single pass over the rows, tracking the previous close of each
+    group and updating Welford's online mean/variance, so the weekly
+    returns are never materialized. Weeks where either close is NaN are
+    skipped, like the NumPy path in analysis.py. Rows must be in date
+    order within each group; groups do not need to be contiguous.
+
+    Args:
+        close: float64 array of closing prices.
+        group_ids: Integer array mapping each row to a group in [0, n_groups).
+        n_groups: The number of groups.
+
+    Returns:
+        A tuple (means, stds, n_rows) of arrays of length n_groups. stds is
+        the sample standard deviation (ddof=1). Groups with too few returns
+        get NaN, and n_rows is 0 for groups with no rows at all.
+    """
+    prev_close = np.empty(n_groups)
+    n_rows = np.zeros(n_groups, dtype=np.int64)
+    count = np.zeros(n_groups, dtype=np.int64)
+    mean = np.zeros(n_groups)
+    m2 = np.zeros(n_groups)
+
+    for i in range(close.shape[0]):
+        g = group_ids[i]
+        if n_rows[g] > 0:
+            weekly_return = close[i] / prev_close[g] - 1.0
+
+            # A missing price on either side gives no return for this week
+            if not np.isnan(weekly_return):
+                count[g] += 1
+                delta = weekly_return - mean[g]
+                mean[g] += delta / count[g]
+                m2[g] += delta * (weekly_return - mean[g])
+        prev_close[g] = close[i]
+        n_rows[g] += 1
+
+    means = np.full(n_groups, np.nan)
+    stds = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        if count[g] > 0:
+            means[g] = mean[g]
+        if count[g] > 1:
+            stds[g] = np.sqrt(m2[g] / (count[g] - 1))
+
+    return means, stds, n_rows
@@ -1,10 +1,9 @@
 #djia_analysis/src/main.py
 '''Main execution program for DJIA Risk/Return Analysis'''
 
-from .data import fetch_data, clean_data
+from .data import fetch_data
 from .analysis import (
-    calculate_return, 
-    calculate_std, 
+    calculate_risk_return,
     calculate_sharpe_ratio, 
     test_hypothesis, 
     plot_results,
@@ -22,17 +21,14 @@ def main():
 
     # 1. Data Pipleine
     print("Fetching and cleaning data...")
-    df_raw = fetch_data()
-    df_clean = clean_data(df_raw)
+    df_clean = fetch_data()
 
     # 2. Calculate Pipeline
     print("Calculating metrics...")
-    df_return = calculate_return(df_clean)
-    df_std = calculate_std(df_clean)
+    df_risk_return = calculate_risk_return(df_clean)
 
     df_sharpe = calculate_sharpe_ratio(
-        df_return, 
-        df_std,
+        df_risk_return,
         risk_free_rate = RISK_FREE_RATE
     )
 
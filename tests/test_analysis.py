@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import analysis
+
+
+def _make_prices():
+    return pd.DataFrame({
+        'stock': pd.Categorical(['AA'] * 5 + ['BA'] * 4 + ['CAT']),
+        'date': pd.to_datetime(
+            ['2011-01-07', '2011-01-14', '2011-01-21', '2011-01-28', '2011-02-04'] +
+            ['2011-01-07', '2011-01-14', '2011-01-21', '2011-01-28'] +
+            ['2011-01-07']
+        ),
+        'close': np.array(
+            [16.42, 15.97, np.nan, 16.18, 17.10] +
+            [69.38, 70.07, 71.68, 70.18] +
+            [93.73],
+            dtype=np.float32,
+        ),
+    })
+
+
+def test_kernel_matches_numpy_path_with_missing_price():
+    pytest.importorskip('numba')
+
+    df = _make_prices()
+    df_kernel = analysis.calculate_risk_return(df, use_kernel=True)
+    df_numpy = analysis.calculate_risk_return(df)
+
+    pd.testing.assert_frame_equal(df_kernel, df_numpy)
+    aa = df_kernel.loc[0, ['annualized_return', 'annualized_std']].to_numpy(dtype=float)
+    assert np.isfinite(aa).all()
+
+
+@pytest.mark.parametrize('use_kernel', [False, True])
+def test_rows_without_stock_are_dropped(use_kernel):
+    if use_kernel:
+        pytest.importorskip('numba')
+
+    df = pd.DataFrame({
+        'stock': pd.Categorical(['AA', 'AA', 'AA', None, 'BA', 'BA']),
+        'date': pd.to_datetime(
+            ['2011-01-07', '2011-01-14', '2011-01-21', '2011-01-07', '2011-01-07', '2011-01-14']
+        ),
+        'close': [16.42, 15.97, 16.18, 50.0, 69.38, 70.07],
+    })
+
+    df_risk_return = analysis.calculate_risk_return(df, use_kernel=use_kernel)
+    df_expected = analysis.calculate_risk_return(
+        df.dropna(subset=['stock']), use_kernel=use_kernel
+    )
+
+    assert df_risk_return['stock'].tolist() == ['AA', 'BA']
+    pd.testing.assert_frame_equal(df_risk_return, df_expected)
+
+
+def test_unsorted_object_stock_with_missing_ticker():
+    df = _make_prices()
+    df['stock'] = df['stock'].astype(object)
+    df.loc[len(df)] = [np.nan, pd.Timestamp('2011-01-07'), 50.0]
+    df_shuffled = df.sample(frac=1, random_state=0)
+
+    df_risk_return = analysis.calculate_risk_return(df_shuffled)
+
+    pd.testing.assert_frame_equal(df_risk_return, analysis.calculate_risk_return(_make_prices()))
+
+
+def test_numpy_path_matches_pandas_groupby():
+    df = _make_prices().sample(frac=1, random_state=1)
+
+    df_sorted = df.sort_values(by=['stock', 'date'])
+    close = df_sorted['close'].astype(np.float64)
+    weekly_return = close.groupby(df_sorted['stock'], observed=True).pct_change(fill_method=None)
+    df_agg = weekly_return.groupby(df_sorted['stock'], observed=True).agg(['mean', 'std'])
+
+    df_risk_return = analysis.calculate_risk_return(df)
+
+    assert df_risk_return['stock'].tolist() == df_agg.index.tolist()
+    np.testing.assert_allclose(
+        df_risk_return['annualized_return'], df_agg['mean'] * 52, rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        df_risk_return['annualized_std'], df_agg['std'] * np.sqrt(52), rtol=1e-12
+    )
+
+
+def test_linear_regression_matches_scipy_linregress():
+    stats = pytest.importorskip('scipy.stats')
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0.1, 0.3, 30)
+    y = 0.4 * x + rng.normal(0.0, 0.08, 30)
+
+    slope, intercept, r_squared, p_value_one_sided = analysis._linear_regression(x, y)
+    expected = stats.linregress(x, y)
+
+    assert slope > 0
+    assert slope == pytest.approx(expected.slope, rel=1e-12)
+    assert intercept == pytest.approx(expected.intercept, rel=1e-12)
+    assert r_squared == pytest.approx(expected.rvalue**2, rel=1e-12)
+    assert p_value_one_sided == pytest.approx(expected.pvalue / 2, rel=1e-9)